@@ -2,9 +2,21 @@
 Configuration file for the Ozon Product Scraper API server.
 
 This module contains configuration settings for the FastAPI server,
-including host and port information.
+including host and port information, scraper resource limits and logging.
 """
 
+import os
+
 # Server configuration
 HOST = "0.0.0.0"  # Allows connections from any IP
 PORT = 8000  # Default port for the server
+WORKERS = os.cpu_count() or 1  # Server processes; each launches its own browser on its first fallback
+LOOP = "uvloop"  # Event loop implementation; uvloop is not available on Windows, use "asyncio" there
+HTTP = "httptools"  # HTTP protocol parser
+
+# Scraper configuration
+CONTEXT_POOL_SIZE = 4  # Number of warm browser contexts, i.e. concurrent /search requests
+
+# Logging configuration
+LOG_LEVEL = "INFO"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
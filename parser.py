@@ -2,165 +2,574 @@
 Ozon Product Scraper
 
 This module provides functionality to scrape product information from Ozon.ru search results.
-It uses Playwright for web scraping and asyncio for asynchronous operations.
+Search results are read from the composer API JSON; Playwright is only used as a
+fallback when the API response cannot be fetched or parsed, e.g. when it is blocked. asyncio is used for
+asynchronous operations.
 """
 
 import asyncio
-import json
-from typing import List, Optional, Dict, Any
-from playwright.async_api import async_playwright, Page, Playwright, Browser, BrowserContext, ElementHandle
+import logging
+import math
+from contextvars import ContextVar
+from typing import Awaitable, Callable, List, Optional, Dict, Any
+from urllib.parse import quote, urlsplit
+import msgspec
+import orjson
+from async_lru import alru_cache
+from playwright.async_api import (async_playwright, TimeoutError as PlaywrightTimeoutError, Page, Playwright, Browser,
+                                  BrowserContext, Route)
+from curl_cffi import CurlError, CurlHttpVersion
 from curl_cffi.requests import AsyncSession
 
+logger = logging.getLogger(__name__)
+
 # Constants
 URL_BASE = "https://www.ozon.ru"
 URL_API = f"{URL_BASE}/api/composer-api.bx/page/json/v2?url="
 
+IMPERSONATE = "chrome124"
+REQUEST_TIMEOUT = 10  # seconds
+
+BROWSER_ARGS = ["--disable-dev-shm-usage", "--disable-blink-features=AutomationControlled"]
+# Only the text of the rendered cards is read, so these resources are never downloaded.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
 VIEWPORT_WIDTH = 1920
 VIEWPORT_HEIGHT = 1080
 
-SCROLL_DEPTH = 5
-SCROLL_STEP = 250
-SCROLL_DELAY = 500  # milliseconds
+SCROLL_ATTEMPTS = 8
+SCROLL_WAIT_TIMEOUT = 1500  # milliseconds
+
+SEARCH_WIDGET_PREFIXES = ("searchResultsV2-", "tileGridDesktop-")
+SEARCH_PAGE_SIZE = 36  # product tiles per search results page
+# textStyle of the priceV2 entries of a tile; the crossed-out ORIGINAL_PRICE is not used.
+TILE_PRICE_STYLE = "PRICE"
+TILE_CARD_PRICE_STYLE = "CARD_PRICE"
 
 CARD_SELECTOR = '.widget-search-result-container > div > div'
 CARD_LINK_SELECTOR = 'a'
 CARD_NAME_SELECTOR = 'span.tsBody500Medium'
-CARD_PRICE_SELECTOR = 'css=[class*="tsHeadline500Medium"]'
+CARD_PRICE_SELECTOR = '.tsHeadline500Medium'
+
+# Collects link, name and price with card of every card in one round-trip to the browser,
+# in the same shape as the tiles parsed from the composer API.
+EXTRACT_CARDS_JS = """
+([cardSel, linkSel, nameSel, priceSel]) => Array.from(document.querySelectorAll(cardSel)).map(card => {
+    const link = card.querySelector(linkSel);
+    const name = card.querySelector(nameSel);
+    const price = card.querySelector(priceSel);
+    if (!link || !link.getAttribute('href') || !name) {
+        return null;
+    }
+    return {link: link.getAttribute('href'), name: name.innerText, price_with_card: price ? price.innerText : null};
+}).filter(Boolean)
+"""
+
+PRODUCT_CACHE_SIZE = 4096
+PRODUCT_CACHE_TTL = 600  # seconds
 
 DEFAULT_CARD_COUNT = 15
+MAX_CONCURRENT_CARDS = 10
+
+CONTEXT_POOL_SIZE = 4
+CONTEXT_MAX_USES = 50
+CONTEXT_ACQUIRE_TIMEOUT = 30  # seconds
 
 ADULT_CONTENT_MARKER = "userAdultModal"
+ADULT_CONTENT_MARKER_BYTES = f'"{ADULT_CONTENT_MARKER}"'.encode()
 ADULT_CONTENT_DESCRIPTION = "Товар для лиц старше 18 лет"
 
 
-class ProductInfo:
+class ProductInfo(msgspec.Struct):
     """Represents information about a product."""
 
-    def __init__(self, product_id: str, short_name: str, full_name: str, description: str, url: str,
-                 price: Optional[str], price_with_card: Optional[str], image_url: Optional[str]):
-        self.product_id = product_id
-        self.short_name = short_name
-        self.full_name = full_name
-        self.description = description
-        self.url = url
-        self.price = price
-        self.price_with_card = price_with_card
-        self.image_url = image_url
+    product_id: str
+    short_name: str
+    full_name: str
+    description: Optional[str]
+    url: str
+    price: Optional[str]
+    price_with_card: Optional[str]
+    image_url: Optional[str]
 
     def __str__(self) -> str:
         return (f"ProductInfo(id={self.product_id}, name={self.short_name}, "
                 f"price={self.price}, price_with_card={self.price_with_card})")
 
 
+def create_session() -> AsyncSession:
+    """Create an HTTP/2 keep-alive session that can be shared between scrapers."""
+    return AsyncSession(http_version=CurlHttpVersion.V2_0, impersonate=IMPERSONATE)
+
+
+async def launch_browser(playwright: Playwright) -> Browser:
+    """Launch a headless Chromium instance for rendering search pages."""
+    return await playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+
+
+async def _block_resources(route: Route) -> None:
+    """Abort requests for resources that are not needed to read the cards."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _find_atom(main_state: List[Dict[str, Any]], atom_type: str, state_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return the first atom of the given type (and optionally state id) from a tile's mainState."""
+    for state in main_state:
+        atom = state.get("atom", {})
+        if atom.get("type") == atom_type and (state_id is None or state.get("id") == state_id):
+            return atom.get(atom_type)
+    return None
+
+
+def _find_price(prices: List[Dict[str, Any]], text_style: str) -> Optional[str]:
+    """Return the text of the first price entry with the given textStyle."""
+    for price in prices:
+        if price.get("textStyle") == text_style:
+            return price.get("text")
+    return None
+
+
+def _api_url(page_url: str) -> str:
+    """Return the composer API URL for a site page URL, encoded so its own query survives."""
+    return URL_API + quote(page_url, safe="/")
+
+
+def _product_id_from_link(link: str) -> str:
+    """Return the product id from a link like /product/some-name-123456/?at=..."""
+    return urlsplit(link).path.rstrip("/").rsplit("-", 1)[-1]
+
+
+class _SearchPage(msgspec.Struct):
+    """The part of a composer API search page that holds the widget states, as raw JSON strings."""
+    widgetStates: Dict[str, str]
+
+
+_search_page_decoder = msgspec.json.Decoder(_SearchPage)
+
+
+def _parse_search_tiles(content: bytes) -> List[Dict[str, Optional[str]]]:
+    """Extract link, name, prices, sku and image of every product tile in a composer API search page."""
+    search_page = _search_page_decoder.decode(content)
+    tiles = []
+    # Bound to locals as they run for every tile of every search page.
+    find_atom, find_price, loads, append = _find_atom, _find_price, orjson.loads, tiles.append
+    for key, state in search_page.widgetStates.items():
+        if not key.startswith(SEARCH_WIDGET_PREFIXES):
+            continue
+        for item in loads(state).get("items", []):
+            link = item.get("action", {}).get("link")
+            main_state = item.get("mainState", [])
+            name_atom = find_atom(main_state, "textAtom", "name") or find_atom(main_state, "textAtom")
+            if not link or not name_atom:
+                continue
+            price_atom = find_atom(main_state, "priceV2")
+            prices = price_atom.get("price", []) if price_atom else []
+            images = item.get("tileImage", {}).get("items", [])
+            append({
+                "link": link,
+                "name": name_atom.get("text"),
+                "price_with_card": find_price(prices, TILE_CARD_PRICE_STYLE),
+                "price": find_price(prices, TILE_PRICE_STYLE),
+                "sku": str(item["sku"]) if item.get("sku") else None,
+                "image_url": images[0].get("image", {}).get("link") if images else None,
+            })
+    return tiles
+
+
+class _Offers(msgspec.Struct):
+    price: str
+    priceCurrency: str
+
+
+class _ProductScript(msgspec.Struct):
+    """LD+JSON product data embedded in the SEO script."""
+    description: str
+    image: str
+    offers: _Offers
+    sku: str
+
+
+class _SeoScript(msgspec.Struct):
+    innerHTML: str
+
+
+class _Seo(msgspec.Struct):
+    title: str
+    script: List[_SeoScript] = []
+
+
+class _LayoutItem(msgspec.Struct):
+    component: str = ""
+
+
+class _ProductResponse(msgspec.Struct):
+    """The fields of a composer API product page that the scraper reads; layout is only needed for adult content."""
+    seo: _Seo
+
+
+class _SeoTitle(msgspec.Struct):
+    title: str
+
+
+class _AdultCheckResponse(msgspec.Struct):
+    """The fields of a composer API product page needed for adult content, without the SEO scripts."""
+    seo: _SeoTitle
+    layout: List[_LayoutItem]
+
+
+_product_response_decoder = msgspec.json.Decoder(_ProductResponse)
+_product_script_decoder = msgspec.json.Decoder(_ProductScript)
+_adult_check_decoder = msgspec.json.Decoder(_AdultCheckResponse)
+
+
+def _parse_product(content: bytes) -> Dict[str, Optional[str]]:
+    """Parse a composer API product page into plain product data."""
+    # The adult content modal replaces the product layout, so pages without the marker
+    # anywhere in the raw bytes can skip the check, and pages with it skip the SEO scripts.
+    if ADULT_CONTENT_MARKER_BYTES in content:
+        adult_check = _adult_check_decoder.decode(content)
+        if adult_check.layout[0].component == ADULT_CONTENT_MARKER:
+            full_name = adult_check.seo.title
+            return {
+                "product_id": str(full_name.split()[-1])[1:-1],
+                "full_name": full_name,
+                "description": ADULT_CONTENT_DESCRIPTION,
+                "price": None,
+                "image_url": None,
+            }
+
+    response = _product_response_decoder.decode(content)
+    full_name = response.seo.title
+    script_data = _product_script_decoder.decode(response.seo.script[0].innerHTML)
+    return {
+        "product_id": script_data.sku,
+        "full_name": full_name,
+        "description": script_data.description,
+        "price": f"{script_data.offers.price} {script_data.offers.priceCurrency}",
+        "image_url": script_data.image,
+    }
+
+
+# The session of the current fetch_product call, kept out of the cache key.
+_fetch_session: ContextVar[AsyncSession] = ContextVar("_fetch_session")
+
+
+@alru_cache(maxsize=PRODUCT_CACHE_SIZE, ttl=PRODUCT_CACHE_TTL)
+async def _fetch_product_cached(product_path: str) -> Dict[str, Optional[str]]:
+    raw_data = await _fetch_session.get().get(_api_url(product_path), timeout=REQUEST_TIMEOUT)
+    return _parse_product(raw_data.content)
+
+
+async def fetch_product(session: AsyncSession, product_url: str) -> Dict[str, Optional[str]]:
+    """
+    Fetch and parse product data from the composer API, cached by product path.
+
+    Tracking query parameters of the link are dropped, so the same product is shared
+    between searches. Parse errors propagate to the caller, so failed responses are
+    never cached.
+    """
+    token = _fetch_session.set(session)
+    try:
+        return await _fetch_product_cached(urlsplit(product_url).path)
+    finally:
+        _fetch_session.reset(token)
+
+
+class BrowserContextPool:
+    """
+    A bounded pool of warm browser contexts, recycled after a fixed number of uses.
+
+    Playwright and the browser are only started on the first acquire, as the browser
+    is just a fallback for when the search API cannot be used.
+    """
+
+    def __init__(self, size: int = CONTEXT_POOL_SIZE, max_uses: int = CONTEXT_MAX_USES,
+                 acquire_timeout: float = CONTEXT_ACQUIRE_TIMEOUT):
+        self.size = size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._uses: Dict[BrowserContext, int] = {}
+        self._missing = 0
+        self._start_lock = asyncio.Lock()
+
+    async def _new_context(self) -> BrowserContext:
+        context = await self.browser.new_context()
+        self._uses[context] = 0
+        return context
+
+    async def start(self) -> None:
+        """Start Playwright, launch the browser and pre-create all contexts, unless already started."""
+        async with self._start_lock:
+            if self.browser:
+                return
+            self.playwright = await async_playwright().start()
+            try:
+                self.browser = await launch_browser(self.playwright)
+            except Exception:
+                await self.playwright.stop()
+                self.playwright = None
+                raise
+            for created in range(self.size):
+                try:
+                    await self._queue.put(await self._new_context())
+                except Exception:
+                    # Leave the rest to _refill on the next acquire.
+                    self._missing = self.size - created
+                    raise
+
+    async def _refill(self) -> None:
+        """Recreate contexts that were lost when they could not be released."""
+        while self._missing > 0:
+            # Reserve the slot before awaiting, so concurrent acquires do not refill it too.
+            self._missing -= 1
+            try:
+                context = await self._new_context()
+            except Exception:
+                self._missing += 1
+                raise
+            await self._queue.put(context)
+
+    async def acquire(self) -> BrowserContext:
+        """
+        Wait for a free context and take it from the pool.
+
+        Raises:
+            asyncio.TimeoutError: If no context is freed within acquire_timeout seconds.
+        """
+        await self.start()
+        await self._refill()
+        context = await asyncio.wait_for(self._queue.get(), timeout=self.acquire_timeout)
+        self._uses[context] += 1
+        return context
+
+    async def release(self, context: BrowserContext) -> None:
+        """
+        Return a context to the pool, replacing it once it has been used max_uses times.
+
+        A context that cannot be cleaned up or replaced is dropped and its slot is
+        recreated on the next acquire, so failures never shrink the pool.
+        """
+        try:
+            if self._uses[context] >= self.max_uses:
+                del self._uses[context]
+                await context.close()
+                context = await self._new_context()
+            else:
+                await context.clear_cookies()
+        except Exception as e:
+            logger.warning("context_release_err err=%r", e)
+            self._uses.pop(context, None)
+            self._missing += 1
+            try:
+                await context.close()
+            except Exception:
+                pass
+            return
+        await self._queue.put(context)
+
+    async def close(self) -> None:
+        """Close all contexts currently in the pool, the browser and Playwright."""
+        while not self._queue.empty():
+            context = self._queue.get_nowait()
+            self._uses.pop(context, None)
+            await context.close()
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+
 class OzonScraper:
     """A class for scraping product information from Ozon.ru."""
 
-    def __init__(self, url: str, count_cards: int = DEFAULT_CARD_COUNT):
+    def __init__(self, url: str, count_cards: int = DEFAULT_CARD_COUNT, browser: Optional[Browser] = None,
+                 context_pool: Optional[BrowserContextPool] = None, session: Optional[AsyncSession] = None,
+                 with_details: bool = True):
         self.url = url
         self.count_cards = count_cards
+        self.with_details = with_details
         self.page: Optional[Page] = None
         self.playwright: Optional[Playwright] = None
-        self.browser: Optional[Browser] = None
+        self.browser: Optional[Browser] = browser
         self.context: Optional[BrowserContext] = None
+        self.context_pool = context_pool
+        self.session: Optional[AsyncSession] = session
+        self._owns_session = session is None
+        self._owns_browser = browser is None and context_pool is None
 
     async def __aenter__(self) -> 'OzonScraper':
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=False)
-        self.context = await self.browser.new_context()
-        self.page = await self.context.new_page()
-        await self.page.set_viewport_size({"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT})
-        self.session = AsyncSession()
+        if self._owns_session:
+            self.session = create_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         await self.close()
 
+    async def _open_page(self) -> Page:
+        """Open a browser page, launching a browser or taking a pooled context if needed."""
+        if self._owns_browser and not self.browser:
+            self.playwright = await async_playwright().start()
+            self.browser = await launch_browser(self.playwright)
+        if self.context_pool:
+            self.context = await self.context_pool.acquire()
+        else:
+            self.context = await self.browser.new_context()
+        self.page = await self.context.new_page()
+        await self.page.route("**/*", _block_resources)
+        await self.page.set_viewport_size({"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT})
+        return self.page
+
     async def close(self) -> None:
-        """Close all open resources."""
-        if self.session:
-            await self.session.close()
-        if self.page:
-            await self.page.close()
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        """Close all open resources. An injected browser or session is left running for its owner."""
+        try:
+            if self._owns_session and self.session:
+                await self.session.close()
+            if self.page:
+                await self.page.close()
+        finally:
+            try:
+                if self.context:
+                    if self.context_pool:
+                        await self.context_pool.release(self.context)
+                    else:
+                        await self.context.close()
+            finally:
+                if self._owns_browser:
+                    if self.browser:
+                        await self.browser.close()
+                    if self.playwright:
+                        await self.playwright.stop()
 
     async def _scroll_down(self) -> None:
-        """Scroll down the page to load more content."""
-        for _ in range(SCROLL_DEPTH):
-            await self.page.evaluate(f'window.scrollBy(0, {SCROLL_STEP})')
-            await self.page.wait_for_timeout(SCROLL_DELAY)
-
-    async def _get_product_info(self, product_url: str) -> ProductInfo:
+        """Scroll down the page until count_cards cards are loaded or no more cards appear."""
+        for _ in range(SCROLL_ATTEMPTS):
+            loaded = await self.page.eval_on_selector_all(CARD_SELECTOR, 'els => els.length')
+            if loaded >= self.count_cards:
+                return
+            await self.page.evaluate('window.scrollBy(0, window.innerHeight)')
+            try:
+                await self.page.wait_for_function(
+                    '([sel, n]) => document.querySelectorAll(sel).length > n',
+                    arg=[CARD_SELECTOR, loaded],
+                    timeout=SCROLL_WAIT_TIMEOUT,
+                )
+            except PlaywrightTimeoutError:
+                return
+
+    async def _get_product_info(self, product_url: str, price_with_card: Optional[str] = None) -> ProductInfo:
         try:
-            raw_data = await self.session.get(URL_API + product_url)
-            json_data: Dict[str, Any] = json.loads(raw_data.content)
-
-            full_name = json_data["seo"]["title"]
-            if json_data["layout"][0]["component"] == ADULT_CONTENT_MARKER:
-                product_id = str(full_name.split()[-1])[1:-1]
-                return ProductInfo(product_id, full_name, full_name, ADULT_CONTENT_DESCRIPTION,
-                                   product_url, None, None, None)
-
-            script_data = json.loads(json_data["seo"]["script"][0]["innerHTML"])
-            description = script_data["description"]
-            image_url = script_data["image"]
-            price = f"{script_data['offers']['price']} {script_data['offers']['priceCurrency']}"
-            product_id = script_data["sku"]
-            return ProductInfo(product_id, full_name, full_name, description, product_url, price, None, image_url)
-        except (json.JSONDecodeError, KeyError, IndexError) as e:
-            print(f"Error parsing product info: {str(e)}")
+            product = await fetch_product(self.session, product_url)
+            return ProductInfo(product["product_id"], product["full_name"], product["full_name"],
+                               product["description"], product_url, product["price"], price_with_card,
+                               product["image_url"])
+        except (msgspec.DecodeError, ValueError, KeyError, IndexError) as e:
+            logger.warning("parse_err url=%s err=%s", product_url, e)
             return ProductInfo("unknown", "Error", "Error", "Failed to parse product info",
-                               product_url, None, None, None)
-
-    async def _get_card_info(self, card: ElementHandle) -> Optional[ProductInfo]:
-        """Extract product information from a card element."""
+                               product_url, None, price_with_card, None)
+
+    async def _get_tile_info(self, tile: Dict[str, Optional[str]]) -> ProductInfo:
+        """
+        Build product information for a tile from the search API or the rendered page.
+
+        The product API is only requested when with_details is set, as the description
+        (and, for rendered pages, the price and image) are not part of the tile.
+        """
+        if self.with_details:
+            return await self._get_product_info(tile["link"], tile["price_with_card"])
+        return ProductInfo(tile.get("sku") or _product_id_from_link(tile["link"]), tile["name"], tile["name"],
+                           None, tile["link"], tile.get("price"), tile["price_with_card"], tile.get("image_url"))
+
+    async def _gather_cards(self, fetch: Callable[[Any], Awaitable[Optional[ProductInfo]]],
+                            items: List[Any]) -> List[ProductInfo]:
+        """Run fetch for every item concurrently, with at most MAX_CONCURRENT_CARDS in flight."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CARDS)
+
+        async def fetch_with_semaphore(item: Any) -> Optional[ProductInfo]:
+            async with semaphore:
+                return await fetch(item)
+
+        results = await asyncio.gather(*(fetch_with_semaphore(item) for item in items), return_exceptions=True)
+        for item, result in zip(items, results):
+            if isinstance(result, BaseException):
+                logger.warning("card_err item=%s err=%r", item, result)
+        return [result for result in results if isinstance(result, ProductInfo)]
+
+    async def _get_searchpage_tiles_page(self, page: int) -> Optional[List[Dict[str, Optional[str]]]]:
+        """
+        Fetch product tiles of one search results page from the composer API.
+
+        Returns None if the page could not be fetched or is not a composer API search page
+        (e.g. an anti-bot challenge); an empty list means the search has no results.
+        """
+        search_url = urlsplit(self.url)
         try:
-            card_url_element = await card.query_selector(CARD_LINK_SELECTOR)
-            if not card_url_element:
-                return None
-
-            card_url = await card_url_element.get_attribute('href')
-            if not card_url:
+            raw_data = await self.session.get(_api_url(f"{search_url.path}?{search_url.query}&page={page}"),
+                                             timeout=REQUEST_TIMEOUT)
+            if raw_data.status_code != 200:
+                logger.warning("search_status_err url=%s page=%s status=%s", self.url, page, raw_data.status_code)
                 return None
+            return _parse_search_tiles(raw_data.content)
+        except CurlError as e:
+            logger.warning("search_request_err url=%s page=%s err=%s", self.url, page, e)
+            return None
+        except (msgspec.DecodeError, orjson.JSONDecodeError, ValueError, KeyError, IndexError, AttributeError) as e:
+            logger.warning("search_parse_err url=%s page=%s err=%s", self.url, page, e)
+            return None
 
-            card_name_element = await card.query_selector(CARD_NAME_SELECTOR)
-            if not card_name_element:
-                return None
-
-            card_name = await card_name_element.inner_text()
-            product_url = URL_BASE + card_url
-            price_with_card_element = await card.query_selector(CARD_PRICE_SELECTOR)
-            price_with_card = await price_with_card_element.inner_text() if price_with_card_element else None
-
-            product_info = await self._get_product_info(card_url)
-            product_info.price_with_card = price_with_card
-            return product_info
-        except Exception as e:
-            print(f"Error processing card: {str(e)}")
+    async def _get_searchpage_tiles(self) -> Optional[List[Dict[str, Optional[str]]]]:
+        """
+        Fetch as many search results pages as count_cards needs, concurrently.
+
+        Returns None if none of the pages could be fetched. Tiles repeated on several
+        pages are only kept once, in page order.
+        """
+        pages_needed = math.ceil(self.count_cards / SEARCH_PAGE_SIZE)
+        pages = await asyncio.gather(*(self._get_searchpage_tiles_page(page) for page in range(1, pages_needed + 1)),
+                                     return_exceptions=True)
+        for page, tiles in enumerate(pages, 1):
+            if isinstance(tiles, BaseException):
+                logger.warning("search_page_err url=%s page=%s err=%r", self.url, page, tiles)
+        pages = [tiles for tiles in pages if isinstance(tiles, list)]
+        if not pages:
             return None
 
-    async def get_searchpage_cards(self) -> List[ProductInfo]:
-        """Fetch and process product cards from the search page."""
-        await self.page.goto(self.url)
-        await asyncio.sleep(1)
-        await self.page.reload()
-        await self.page.wait_for_load_state('networkidle')
+        seen = set()
+        unique_tiles = []
+        for tiles in pages:
+            for tile in tiles:
+                path = urlsplit(tile["link"]).path
+                if path not in seen:
+                    seen.add(path)
+                    unique_tiles.append(tile)
+        return unique_tiles
+
+    async def _get_browser_cards(self) -> List[ProductInfo]:
+        """Fetch and process product cards by rendering the search page in the browser."""
+        page = await self._open_page()
+        await page.goto(self.url)
+        await page.wait_for_load_state('networkidle')
 
         await self._scroll_down()
 
-        cards = await self.page.query_selector_all(CARD_SELECTOR)
-        cards_info = []
-
-        for card in cards[:self.count_cards]:
-            product_info = await self._get_card_info(card)
-            if product_info:
-                cards_info.append(product_info)
+        cards = await page.evaluate(
+            EXTRACT_CARDS_JS, [CARD_SELECTOR, CARD_LINK_SELECTOR, CARD_NAME_SELECTOR, CARD_PRICE_SELECTOR]
+        )
+        return await self._gather_cards(self._get_tile_info, cards[:self.count_cards])
 
-        return cards_info
+    async def get_searchpage_cards(self) -> List[ProductInfo]:
+        """Fetch and process product cards from the search page."""
+        tiles = await self._get_searchpage_tiles()
+        if tiles is None:
+            return await self._get_browser_cards()
+        return await self._gather_cards(self._get_tile_info, tiles[:self.count_cards])
 
 
 async def main() -> None:
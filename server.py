@@ -9,26 +9,76 @@ The server uses the OzonScraper class from the parser module to
 perform the actual web scraping.
 """
 
+import logging
+import queue
+from urllib.parse import urlencode
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List
-from parser import OzonScraper
+import msgspec
+from parser import OzonScraper, BrowserContextPool, create_session
 import config
 
 app = FastAPI(
     title="Ozon Product Scraper API",
     description="API для поиска и скрапинга товаров на Ozon.ru",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+def setup_logging() -> QueueListener:
+    """
+    Route log records through a queue to a background thread, so that
+    writing them to stderr never blocks the event loop.
+
+    Returns:
+        QueueListener: The started listener; stop it on shutdown to flush the queue.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(config.LOG_FORMAT))
+    listener = QueueListener(log_queue, stream_handler)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(config.LOG_LEVEL)
+    root_logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
+
+@app.on_event("startup")
+async def startup():
+    """
+    Set up logging, create the HTTP session and the pool of browser contexts
+    shared by all requests. The pool only launches Chromium when a search
+    first falls back to the browser.
+    """
+    app.state.log_listener = setup_logging()
+    app.state.http = create_session()
+    app.state.ctx_pool = BrowserContextPool(size=config.CONTEXT_POOL_SIZE)
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Close the context pool with its browser, close the HTTP session and
+    flush pending log records.
+    """
+    await app.state.ctx_pool.close()
+    await app.state.http.close()
+    app.state.log_listener.stop()
+
 class SearchRequest(BaseModel):
     """
     Represents a search request.
 
     Attributes:
         query (str): The search query string.
+        details (bool): Whether to fetch each product page for its description,
+            price and image, or to return only the data of the search results.
     """
     query: str
+    details: bool = True
 
 class ProductInfoResponse(BaseModel):
     """
@@ -38,7 +88,7 @@ class ProductInfoResponse(BaseModel):
         product_id (str): Unique identifier for the product.
         short_name (str): Short name or title of the product.
         full_name (str): Full name or title of the product.
-        description (str): Product description.
+        description (str | None): Product description (if details were requested).
         url (str): URL of the product page.
         price (str | None): Price of the product (if available).
         price_with_card (str | None): Price with Ozon card discount (if available).
@@ -47,7 +97,7 @@ class ProductInfoResponse(BaseModel):
     product_id: str
     short_name: str
     full_name: str
-    description: str
+    description: str | None
     url: str
     price: str | None
     price_with_card: str | None
@@ -62,7 +112,7 @@ class SearchResponse(BaseModel):
     """
     results: List[ProductInfoResponse]
 
-@app.post("/search", response_model=SearchResponse)
+@app.post("/search", responses={200: {"model": SearchResponse}})
 async def search(request: SearchRequest):
     """
     Perform a search on Ozon.ru and return scraped product information.
@@ -71,35 +121,33 @@ async def search(request: SearchRequest):
         request (SearchRequest): The search request containing the query.
 
     Returns:
-        SearchResponse: A list of product information results.
+        dict: A list of product information results in the SearchResponse format.
+        The data is built from trusted scraper output, so it is serialized
+        directly instead of being re-validated by the response models.
 
     Raises:
         HTTPException: If an error occurs during scraping or processing.
     """
-    url = f"https://www.ozon.ru/search/?text={request.query}&from_global=true"
+    url = "https://www.ozon.ru/search/?" + urlencode({"text": request.query, "from_global": "true"})
 
     try:
-        async with OzonScraper(url) as scraper:
+        async with OzonScraper(url, context_pool=app.state.ctx_pool, session=app.state.http,
+                               with_details=request.details) as scraper:
             search_cards = await scraper.get_searchpage_cards()
 
         results = [
-            ProductInfoResponse(
-                product_id=card.product_id,
-                short_name=card.short_name,
-                full_name=card.full_name,
-                description=card.description,
-                url=f"https://ozon.ru/product/{card.product_id}",
-                price=card.price,
-                price_with_card=card.price_with_card,
-                image_url=card.image_url
-            )
+            {
+                **msgspec.to_builtins(card),
+                "url": f"https://ozon.ru/product/{card.product_id}",
+            }
             for card in search_cards
         ]
 
-        return SearchResponse(results=results)
+        return {"results": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=config.HOST, port=config.PORT)
\ No newline at end of file
+    uvicorn.run("server:app", host=config.HOST, port=config.PORT, loop=config.LOOP, http=config.HTTP,
+                workers=config.WORKERS)
\ No newline at end of file
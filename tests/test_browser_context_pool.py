@@ -0,0 +1,139 @@
+"""Tests for BrowserContextPool, run against a fake browser instead of Playwright."""
+
+import asyncio
+
+import parser
+from parser import BrowserContextPool
+
+
+class FakeContext:
+    def __init__(self, fail_clear: bool = False):
+        self.fail_clear = fail_clear
+        self.closed = False
+
+    async def clear_cookies(self) -> None:
+        await asyncio.sleep(0)
+        if self.fail_clear:
+            raise RuntimeError("page crashed")
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self) -> FakeContext:
+        await asyncio.sleep(0)
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        pass
+
+
+async def _started_pool(size: int) -> BrowserContextPool:
+    pool = BrowserContextPool(size=size, acquire_timeout=1)
+    pool.browser = FakeBrowser()
+    for _ in range(size):
+        await pool._queue.put(await pool._new_context())
+    return pool
+
+
+def test_concurrent_acquires_refill_lost_contexts_once():
+    async def run():
+        pool = await _started_pool(4)
+        contexts = [await pool.acquire() for _ in range(4)]
+        for context in contexts:
+            context.fail_clear = True
+            await pool.release(context)
+        assert pool._missing == 4
+
+        acquired = await asyncio.gather(*(pool.acquire() for _ in range(4)))
+
+        assert all(isinstance(context, FakeContext) for context in acquired)
+        assert len(set(acquired)) == 4
+        assert pool._missing == 0
+        assert len(pool.browser.contexts) == 8
+
+        for context in acquired:
+            await pool.release(context)
+        await pool.acquire()
+        assert len(pool.browser.contexts) == 8
+
+    asyncio.run(run())
+
+
+def test_failed_refill_keeps_slot_missing():
+    async def run():
+        pool = await _started_pool(1)
+        context = await pool.acquire()
+        context.fail_clear = True
+        await pool.release(context)
+
+        async def broken_new_context():
+            raise RuntimeError("browser disconnected")
+
+        pool.browser.new_context = broken_new_context
+        try:
+            await pool.acquire()
+        except RuntimeError:
+            pass
+        assert pool._missing == 1
+
+    asyncio.run(run())
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.browser = FakeBrowser()
+
+    async def start(self) -> "FakePlaywright":
+        return self
+
+    async def stop(self) -> None:
+        pass
+
+
+def test_cold_start_with_concurrent_acquires(monkeypatch):
+    playwright = FakePlaywright()
+
+    async def launch_browser(_):
+        await asyncio.sleep(0)
+        return playwright.browser
+
+    monkeypatch.setattr(parser, "async_playwright", lambda: playwright)
+    monkeypatch.setattr(parser, "launch_browser", launch_browser)
+
+    async def run():
+        pool = BrowserContextPool(size=4, acquire_timeout=1)
+        acquired = await asyncio.gather(*(pool.acquire() for _ in range(4)))
+
+        assert len(set(acquired)) == 4
+        assert len(playwright.browser.contexts) == 4
+        assert pool._missing == 0
+
+    asyncio.run(run())
+
+
+def test_start_pre_creates_all_contexts(monkeypatch):
+    playwright = FakePlaywright()
+
+    async def launch_browser(_):
+        return playwright.browser
+
+    monkeypatch.setattr(parser, "async_playwright", lambda: playwright)
+    monkeypatch.setattr(parser, "launch_browser", launch_browser)
+
+    async def run():
+        pool = BrowserContextPool(size=4, acquire_timeout=1)
+        await pool.start()
+        await pool.start()
+
+        assert pool._queue.qsize() == 4
+        assert pool._missing == 0
+        assert len(playwright.browser.contexts) == 4
+
+    asyncio.run(run())